@@ -57,6 +57,17 @@ if 'fastecdsa' not in sys.modules:
     USE_FASTECDSA = False
     import ecdsa
 
+USE_COINCURVE = os.getenv("USE_COINCURVE") not in ["false", "False", "0", "FALSE"]
+try:
+    if USE_COINCURVE is not False:
+        import coincurve
+        USE_COINCURVE = True
+except ImportError:
+    USE_COINCURVE = False
+
+# Local reference to the OpenSSL backed sha256 constructor, used for the many hashes when verifying transactions
+_sha256 = hashlib.sha256
+
 
 class EncodingError(Exception):
     """ Log and raise encoding errors """
@@ -326,22 +337,35 @@ def varbyteint_to_int(byteint):
         size = 4
     else:  # integer of 8 bytes
         size = 8
-    return int.from_bytes(byteint[1:1+size][::-1], 'big'), size + 1
+    return int.from_bytes(byteint[1:1+size], 'little'), size + 1
 
 
 def read_varbyteint(s):
     """
-    Read variable length integer from BytesIO stream. Wrapper for the varbyteint_to_int method
+    Read variable length integer from BytesIO stream. Reads only the bytes used by the integer, so the stream
+    position does not need to be restored afterwards.
 
     :param s: A binary stream
     :type s: BytesIO
 
     :return int:
     """
-    pos = s.tell()
-    value, size = varbyteint_to_int(s.read(9))
-    s.seek(pos + size)
-    return value
+    byteint = s.read(1)
+    if not byteint:
+        raise EncodingError("Could not read variable length integer, end of stream reached")
+    ni = byteint[0]
+    if ni < 253:
+        return ni
+    if ni == 253:  # integer of 2 bytes
+        size = 2
+    elif ni == 254:  # integer of 4 bytes
+        size = 4
+    else:  # integer of 8 bytes
+        size = 8
+    data = s.read(size)
+    if len(data) != size:
+        raise EncodingError("Could not read variable length integer, end of stream reached")
+    return int.from_bytes(data, 'little')
 
 
 def int_to_varbyteint(inp):
@@ -795,9 +819,9 @@ def double_sha256(string, as_hex=False):
     :return bytes, str:
     """
     if not as_hex:
-        return hashlib.sha256(hashlib.sha256(string).digest()).digest()
+        return _sha256(_sha256(string).digest()).digest()
     else:
-        return hashlib.sha256(hashlib.sha256(string).digest()).hexdigest()
+        return _sha256(_sha256(string).digest()).hexdigest()
 
 
 def hash160(string):
@@ -809,7 +833,7 @@ def hash160(string):
 
     :return bytes: RIPEMD-160 hash of script
     """
-    return hashlib.new('ripemd160', hashlib.sha256(string).digest()).digest()
+    return hashlib.new('ripemd160', _sha256(string).digest()).digest()
 
 
 def bip38_decrypt(encrypted_privkey, password):
@@ -21,6 +21,7 @@
 import hmac
 import random
 import collections
+import functools
 import json
 
 from bitcoinlib.networks import Network, network_by_value, wif_prefix_search
@@ -35,11 +36,17 @@ if USE_FASTECDSA:
     from fastecdsa.curve import secp256k1 as fastecdsa_secp256k1
     from fastecdsa import keys as fastecdsa_keys
     from fastecdsa import point as fastecdsa_point
+    from fastecdsa.encoding.der import InvalidDerSignature
+    _der_decode_errors = (EncodingError, InvalidDerSignature)
 else:
     import ecdsa
+    _der_decode_errors = (EncodingError, ecdsa.der.UnexpectedDER)
 
     secp256k1_curve = ecdsa.ellipticcurve.CurveFp(secp256k1_p, secp256k1_a, secp256k1_b)
-    secp256k1_generator = ecdsa.ellipticcurve.Point(secp256k1_curve, secp256k1_Gx, secp256k1_Gy, secp256k1_n)
+    # Use generator point in jacobian coordinates from ecdsa library, with precomputed multiplication table
+    secp256k1_generator = ecdsa.SECP256k1.generator
+if USE_COINCURVE:
+    import coincurve
 
 _logger = logging.getLogger(__name__)
 
@@ -779,39 +786,32 @@ class Key(object):
 
         if not self.is_private:
             self.secret = None
-            pub_key = to_hexstring(import_key)
-            if len(pub_key) == 130:
-                self.public_uncompressed_hex = pub_key
-                self.x_hex = pub_key[2:66]
-                self.y_hex = pub_key[66:130]
-                self._y = int(self.y_hex, 16)
+            pub_key = import_key if isinstance(import_key, bytes) else to_bytes(import_key)
+            x_bytes = pub_key[1:33]
+            self._x = int.from_bytes(x_bytes, 'big')
+            if len(pub_key) == 65:
                 self.compressed = False
-                if self._y % 2:
-                    prefix = '03'
-                else:
-                    prefix = '02'
-                self.public_hex = pub_key
-                self.public_compressed_hex = prefix + self.x_hex
+                y_bytes = pub_key[33:65]
+                self._y = int.from_bytes(y_bytes, 'big')
+                prefix = b'\x03' if self._y % 2 else b'\x02'
+                self.public_uncompressed_byte = pub_key
+                self.public_compressed_byte = prefix + x_bytes
             else:
-                self.public_hex = pub_key
-                self.x_hex = pub_key[2:66]
                 self.compressed = True
-                # Calculate y from x with y=x^3 + 7 function
-                sign = pub_key[:2] == '03'
-                self._x = int(self.x_hex, 16)
-                ys = pow(self._x, 3, secp256k1_p) + 7 % secp256k1_p
-                self._y = mod_sqrt(ys)
-                if self._y & 1 != sign:
-                    self._y = secp256k1_p - self._y
-                self.y_hex = change_base(self._y, 10, 16, 64)
-                self.public_uncompressed_hex = '04' + self.x_hex + self.y_hex
-                self.public_compressed_hex = pub_key
-            self.public_compressed_byte = bytes.fromhex(self.public_compressed_hex)
-            self.public_uncompressed_byte = bytes.fromhex(self.public_uncompressed_hex)
+                self._y = _public_key_y(pub_key)
+                y_bytes = self._y.to_bytes(32, 'big')
+                self.public_compressed_byte = pub_key
+                self.public_uncompressed_byte = b'\x04' + x_bytes + y_bytes
+            self.x_hex = x_bytes.hex()
+            self.y_hex = y_bytes.hex()
+            self.public_compressed_hex = self.public_compressed_byte.hex()
+            self.public_uncompressed_hex = self.public_uncompressed_byte.hex()
             if self.compressed:
                 self.public_byte = self.public_compressed_byte
+                self.public_hex = self.public_compressed_hex
             else:
                 self.public_byte = self.public_uncompressed_byte
+                self.public_hex = self.public_uncompressed_hex
         elif self.is_private and self.key_format == 'decimal':
             self.secret = int(import_key)
             self.private_hex = change_base(self.secret, 10, 16, 64)
@@ -879,22 +879,22 @@ class Key(object):
                 self._x = p.x
                 self._y = p.y
             else:
+                p = p.to_affine()
                 self._x = p.x()
                 self._y = p.y()
-            self.x_hex = change_base(self._x, 10, 16, 64)
-            self.y_hex = change_base(self._y, 10, 16, 64)
-            if self._y % 2:
-                prefix = '03'
-            else:
-                prefix = '02'
+            x_bytes = self._x.to_bytes(32, 'big')
+            y_bytes = self._y.to_bytes(32, 'big')
+            self.x_hex = x_bytes.hex()
+            self.y_hex = y_bytes.hex()
+            prefix = b'\x03' if self._y % 2 else b'\x02'
+
+            self.public_compressed_byte = prefix + x_bytes
+            self.public_uncompressed_byte = b'\x04' + x_bytes + y_bytes
+            self.public_byte = self.public_compressed_byte if self.compressed else self.public_uncompressed_byte
 
-            self.public_compressed_hex = prefix + self.x_hex
-            self.public_uncompressed_hex = '04' + self.x_hex + self.y_hex
+            self.public_compressed_hex = self.public_compressed_byte.hex()
+            self.public_uncompressed_hex = self.public_uncompressed_byte.hex()
             self.public_hex = self.public_compressed_hex if self.compressed else self.public_uncompressed_hex
-
-            self.public_compressed_byte = bytes.fromhex(self.public_compressed_hex)
-            self.public_uncompressed_byte = bytes.fromhex(self.public_uncompressed_hex)
-            self.public_byte = self.public_compressed_byte if self.compressed else self.public_uncompressed_byte
         self._address_obj = None
         self._wif = None
         self._wif_prefix = None
@@ -1846,7 +1846,7 @@ class HDKey(Key):
             ki_x = ki.x
             ki_y = ki.y
         else:
-            ki = ec_point(key) + ecdsa.ellipticcurve.Point(secp256k1_curve, x, y, secp256k1_n)
+            ki = (ec_point(key) + ecdsa.ellipticcurve.Point(secp256k1_curve, x, y, secp256k1_n)).to_affine()
             ki_x = ki.x()
             ki_y = ki.y()
 
@@ -1917,18 +1917,15 @@ class Signature(object):
         :return Signature:
         """
 
-        der_signature = ''
-        hash_type = SIGHASH_ALL
         if len(signature) > 64 and signature.startswith(b'\x30'):
-            der_signature = signature[:-1]
-            hash_type = int.from_bytes(signature[-1:], 'big')
-            signature = convert_der_sig(signature[:-1], as_hex=False)
+            # r and s values are decoded from the DER signature when they are needed
+            return Signature(None, None, der_signature=signature[:-1], public_key=public_key,
+                             hash_type=signature[-1])
         if len(signature) != 64:
             raise BKeyError("Signature length must be 64 bytes or 128 character hexstring")
         r = int.from_bytes(signature[:32], 'big')
         s = int.from_bytes(signature[32:], 'big')
-        return Signature(r, s, signature=signature, der_signature=der_signature, public_key=public_key,
-                         hash_type=hash_type)
+        return Signature(r, s, signature=signature, public_key=public_key)
 
     @deprecated
     @staticmethod
@@ -2031,10 +2028,10 @@ class Signature(object):
         >>> sig.hex()
         '48e994862e2cdb372149bad9d9894cf3a5562b4565035943efe0acc502769d351cb88752b5fe8d70d85f3541046df617f8459e991d06a7c0db13b5d4531cd6d4'
         
-        :param r: r value of signature
-        :type r: int
-        :param s: s value of signature
-        :type s: int
+        :param r: r value of signature. Use None to decode from der_signature when needed
+        :type r: int, None
+        :param s: s value of signature. Use None to decode from der_signature when needed
+        :type s: int, None
         :param txid: Transaction hash z to sign if known
         :type txid: bytes, hexstring
         :param secret: Private key secret number
@@ -2049,14 +2046,15 @@ class Signature(object):
         :type k: int
         """
 
-        self.r = int(r)
-        self.s = int(s)
+        self._r = None
+        self._s = None
+        if r is None or s is None:
+            if not der_signature:
+                raise BKeyError('Invalid Signature: provide r and s value or a DER encoded signature')
+        else:
+            self._set_rs(int(r), int(s))
         self.x = None
         self.y = None
-        if self.r < 1 or self.r >= secp256k1_n:
-            raise BKeyError('Invalid Signature: r is not a positive integer smaller than the curve order')
-        elif self.s < 1 or self.s >= secp256k1_n:
-            raise BKeyError('Invalid Signature: s is not a positive integer smaller than the curve order')
         self._txid = None
         self.txid = txid
         self.secret = None if not secret else int(secret)
@@ -2078,10 +2076,49 @@ class Signature(object):
 
         self._der_encoded = to_bytes(der_signature) + self.hash_type_byte
 
+    def _set_rs(self, r, s):
+        if r < 1 or r >= secp256k1_n:
+            raise BKeyError('Invalid Signature: r is not a positive integer smaller than the curve order')
+        elif s < 1 or s >= secp256k1_n:
+            raise BKeyError('Invalid Signature: s is not a positive integer smaller than the curve order')
+        self._r = r
+        self._s = s
+
+    def _decode_der(self):
+        try:
+            signature = convert_der_sig(to_bytes(self.der_signature), as_hex=False)
+        except _der_decode_errors as e:
+            raise BKeyError("Invalid Signature: could not decode DER signature (%s)" % e)
+        if len(signature) != 64:
+            raise BKeyError("Signature length must be 64 bytes or 128 character hexstring")
+        self._set_rs(int.from_bytes(signature[:32], 'big'), int.from_bytes(signature[32:], 'big'))
+
+    @property
+    def r(self):
+        if self._r is None:
+            self._decode_der()
+        return self._r
+
+    @property
+    def s(self):
+        if self._s is None:
+            self._decode_der()
+        return self._s
+
+    def __setstate__(self, state):
+        # Signatures pickled before r and s were decoded lazily contain r and s attributes
+        if 'r' in state:
+            state['_r'] = state.pop('r')
+            state['_s'] = state.pop('s')
+        self.__dict__.update(state)
+
     def __repr__(self):
         der_sig = '' if not self._der_encoded else self._der_encoded.hex()
-        return "<Signature(r=%d, s=%d, signature=%s, der_signature=%s)>" % \
-               (self.r, self.s, self.hex(), der_sig)
+        try:
+            r, s = self.r, self.s
+        except BKeyError:
+            return "<Signature(der_signature=%s)>" % der_sig
+        return "<Signature(r=%d, s=%d, signature=%s, der_signature=%s)>" % (r, s, self.hex(), der_sig)
 
     def __str__(self):
         return self.as_der_encoded(as_hex=True)
@@ -2201,10 +2238,46 @@ class Signature(object):
         if not self.txid or not self.public_key:
             raise BKeyError("Please provide txid and public_key to verify signature")
 
-        if USE_FASTECDSA:
+        if USE_COINCURVE:
+            transaction_to_sign = bytes.fromhex(self.txid)
+            if len(transaction_to_sign) != 32:
+                transaction_to_sign = double_sha256(transaction_to_sign)
+            try:
+                pub_key = _coincurve_public_key(self.public_key.public_byte)
+            except ValueError as e:
+                _logger.info("Could not verify signature %s, invalid public key (error %s)", self, e)
+                return False
+            strict_der_verified = False
+            if self._s is None:
+                # Try the DER signature as is first, to avoid decoding r and s in Python
+                try:
+                    if pub_key.verify(to_bytes(self.der_signature), transaction_to_sign, hasher=None):
+                        return True
+                    strict_der_verified = True
+                except ValueError:
+                    pass
+        try:
+            r, s = self.r, self.s
+        except BKeyError as e:
+            _logger.info("Could not verify signature %s (error %s)", self, e)
+            return False
+
+        if USE_COINCURVE:
+            if strict_der_verified and s <= secp256k1_n // 2:
+                # Signature is already verified by libsecp256k1, only retry if s needs to be normalized
+                return False
+            # libsecp256k1 only accepts strict DER signatures with a low s value, so normalize before verifying
+            if s > secp256k1_n // 2:
+                s = secp256k1_n - s
+            try:
+                return pub_key.verify(der_encode_sig(r, s), transaction_to_sign, hasher=None)
+            except ValueError as e:
+                _logger.info("Could not verify signature %s (error %s)", self, e)
+                return False
+        elif USE_FASTECDSA:
             return _ecdsa.verify(
-                str(self.r),
-                str(self.s),
+                str(r),
+                str(s),
                 self.txid,
                 str(self.x),
                 str(self.y),
@@ -2217,24 +2290,13 @@ class Signature(object):
             )
         else:
             transaction_to_sign = to_bytes(self.txid)
-            signature = self.bytes()
             if len(transaction_to_sign) != 32:
                 transaction_to_sign = double_sha256(transaction_to_sign)
-            ver_key = ecdsa.VerifyingKey.from_string(self.public_key.public_uncompressed_byte[1:],
-                                                     curve=ecdsa.SECP256k1)
-            try:
-                if len(signature) > 64 and signature.startswith(b'\x30'):
-                    try:
-                        signature = convert_der_sig(signature[:-1], as_hex=False)
-                    except Exception:
-                        pass
-                ver_key.verify_digest(signature, transaction_to_sign)
-            except ecdsa.keys.BadSignatureError:
-                return False
-            except ecdsa.keys.BadDigestError as e:
-                _logger.info("Bad Digest %s (error %s)" % (signature.hex(), e))
-                return False
-            return True
+            # Create public key from known point instead of decoding the serialized public key again
+            point = ecdsa.ellipticcurve.PointJacobi(secp256k1_curve, self.x, self.y, 1, secp256k1_n)
+            pub_key = ecdsa.ecdsa.Public_key(secp256k1_generator, point)
+            # Call Public_key.verifies directly to avoid encoding and decoding of the signature and digest
+            return pub_key.verifies(int.from_bytes(transaction_to_sign, 'big'), ecdsa.ecdsa.Signature(r, s))
 
 
 def sign(txid, private, use_rfc6979=True, k=None):
@@ -2298,7 +2360,7 @@ def ec_point(m):
     :param m: A point on the elliptic curve
     :type m: int
 
-    :return Point: Point multiplied by generator G
+    :return fastecdsa.point.Point, ecdsa.ellipticcurve.PointJacobi: Point multiplied by generator G
     """
     m = int(m)
     if USE_FASTECDSA:
@@ -2325,3 +2387,34 @@ def mod_sqrt(a):
     # Square root formula: k = (secp256k1_p - 3) // 4
     k = 28948022309329048855892746252171976963317496166410141009864396001977208667915
     return pow(a, k + 1, secp256k1_p)
+
+
+@functools.lru_cache(maxsize=4096)
+def _public_key_y(public_compressed_byte):
+    """
+    Calculate y-coordinate of a compressed public key with y=x^3 + 7 function. Results are cached because the same
+    public keys are often used in many inputs of a block.
+
+    :param public_compressed_byte: Compressed public key
+    :type public_compressed_byte: bytes
+
+    :return int:
+    """
+    x = int.from_bytes(public_compressed_byte[1:33], 'big')
+    y = mod_sqrt(pow(x, 3, secp256k1_p) + 7 % secp256k1_p)
+    if y & 1 != (public_compressed_byte[:1] == b'\x03'):
+        y = secp256k1_p - y
+    return y
+
+
+@functools.lru_cache(maxsize=4096)
+def _coincurve_public_key(public_byte):
+    """
+    Parse public key to a coincurve PublicKey object. Results are cached to avoid parsing the same public key again.
+
+    :param public_byte: Compressed or uncompressed public key
+    :type public_byte: bytes
+
+    :return coincurve.PublicKey:
+    """
+    return coincurve.PublicKey(public_byte)
@@ -182,9 +182,15 @@ class BitcoindClient(BaseClient):
         for i in t.inputs:
             if i.prev_txid == b'\x00' * 32:
                 i.script_type = 'coinbase'
-                continue
-            if get_input_values:
-                txi = self.proxy.getrawtransaction(i.prev_txid.hex(), 1)
+        prev_txids = list(dict.fromkeys([i.prev_txid.hex() for i in t.inputs if i.script_type != 'coinbase']))
+        if get_input_values and prev_txids:
+            # Retrieve all previous transactions in a single batched request
+            prev_txs = self.proxy.batch_([['getrawtransaction', txid, 1] for txid in prev_txids])
+            prev_txs = dict(zip(prev_txids, prev_txs))
+            for i in t.inputs:
+                if i.script_type == 'coinbase':
+                    continue
+                txi = prev_txs[i.prev_txid.hex()]
                 i.value = int(round(float(txi['vout'][i.output_n_int]['value']) / self.network.denominator))
         for o in t.outputs:
             o.spent = None
@@ -22,16 +22,37 @@ from datetime import datetime
 import json
 import pickle
 import random
+import struct
 from io import BytesIO
 from bitcoinlib.encoding import *
 from bitcoinlib.config.opcodes import *
-from bitcoinlib.keys import HDKey, Key, deserialize_address, Address, sign, verify, Signature
+from bitcoinlib.keys import HDKey, Key, deserialize_address, Address, sign, verify, Signature, BKeyError
 from bitcoinlib.networks import Network
 from bitcoinlib.values import Value, value_to_satoshi
 from bitcoinlib.scripts import Script
 
 _logger = logging.getLogger(__name__)
 
+# Unpackers for the fixed size little-endian integers in serialized transactions
+_UINT16 = struct.Struct('<H')
+_UINT32 = struct.Struct('<I')
+_UINT64 = struct.Struct('<Q')
+
+
+def _varint_unpack_from(rawtx, cursor):
+    # Decode CompactSize variable length integer at cursor without slicing, returns tuple with integer and size
+    try:
+        ni = rawtx[cursor]
+        if ni < 253:
+            return ni, 1
+        if ni == 253:
+            return _UINT16.unpack_from(rawtx, cursor + 1)[0], 3
+        if ni == 254:
+            return _UINT32.unpack_from(rawtx, cursor + 1)[0], 5
+        return _UINT64.unpack_from(rawtx, cursor + 1)[0], 9
+    except (IndexError, struct.error):
+        raise TransactionError("Variable length integer not found. Probably malformed raw transaction")
+
 
 class TransactionError(Exception):
     """
@@ -46,92 +67,170 @@ class TransactionError(Exception):
         return self.msg
 
 
-@deprecated  # Replaced by Transaction.parse() in version 0.6
-def transaction_deserialize(rawtx, network=DEFAULT_NETWORK, check_size=True):
+def transaction_deserialize_fast(rawtx, check_size=True):
     """
-    Deserialize a raw transaction
-    
-    Returns a dictionary with list of input and output objects, locktime and version.
-    
-    Will raise an error if wrong number of inputs are found or if there are no output found.
-    
+    Deserialize a raw transaction to a dictionary with plain values. Does not create Input, Output or Script
+    objects, so this is a lot faster than :func:`Transaction.parse` when only the raw transaction data is needed,
+    for instance when parsing many transactions from blocks.
+
+    >>> rawtx = ('0100000001d26d5f40d3bd8f9bb02d7e5d2d39d5e4fbc79f3e6e5f1326dca1a56c39cbe5150000000000ffffffff0140'
+    ...          '420f00000000001976a914c4c5d791fcb4654a1ef5e03fe0ad3d37c5d8b9b888ac00000000')
+    >>> t = transaction_deserialize_fast(rawtx)
+    >>> t['txid']
+    'f9b1fdf18f4a5f3c3edadaa62ab7ce4ac21cbd45673ca4437a9f54063d7372f6'
+    >>> t['outputs'][0]['value']
+    1000000
+
     :param rawtx: Raw transaction as hexadecimal string or bytes
     :type rawtx: str, bytes
-    :param network: Network code, i.e. 'bitcoin', 'testnet', 'litecoin', etc. Leave emtpy for default network
-    :type network: str, Network
     :param check_size: Check if not bytes are left when parsing is finished. Disable when parsing list of transactions, such as the transactions in a raw block. Default is True
     :type check_size: bool
 
-    :return Transaction:
+    :return dict: Dictionary with txid, version, witness_type, coinbase, flag, inputs, outputs, output_total, locktime and size
     """
 
     rawtx = to_bytes(rawtx)
-    coinbase = False
+    mv = memoryview(rawtx)
     flag = None
     witness_type = 'legacy'
+    coinbase = False
 
-    version = rawtx[0:4][::-1]
+    if len(rawtx) < 4:
+        raise TransactionError("Transaction version not found. Probably malformed raw transaction")
+    version = _UINT32.unpack_from(rawtx, 0)[0]
     cursor = 4
     if rawtx[4:5] == b'\0':
-        flag = rawtx[5:6]
-        if flag == b'\1':
+        flag = rawtx[5] if len(rawtx) > 5 else None
+        if flag == 1:
             witness_type = 'segwit'
         cursor += 2
-    n_inputs, size = varbyteint_to_int(rawtx[cursor:cursor + 9])
+    body_start = cursor
+    n_inputs, size = _varint_unpack_from(rawtx, cursor)
     cursor += size
     inputs = []
-    if not isinstance(network, Network):
-        network = Network(network)
-    for n in range(0, n_inputs):
-        inp_hash = rawtx[cursor:cursor + 32][::-1]
-        if not len(inp_hash):
+    for n in range(n_inputs):
+        if len(rawtx) < cursor + 36:
             raise TransactionError("Input transaction hash not found. Probably malformed raw transaction")
-        if inp_hash == 32 * b'\0':
+        prev_txid = rawtx[cursor:cursor + 32][::-1]
+        if prev_txid == 32 * b'\0':
             coinbase = True
-        output_n = rawtx[cursor + 32:cursor + 36][::-1]
+        output_n = _UINT32.unpack_from(rawtx, cursor + 32)[0]
         cursor += 36
-        unlocking_script_size, size = varbyteint_to_int(rawtx[cursor:cursor + 9])
+        script_size, size = _varint_unpack_from(rawtx, cursor)
         cursor += size
-        unlocking_script = rawtx[cursor:cursor + unlocking_script_size]
-        inp_type = 'legacy'
-        if witness_type == 'segwit' and not unlocking_script_size:
-            inp_type = 'segwit'
-        cursor += unlocking_script_size
-        sequence_number = rawtx[cursor:cursor + 4]
+        unlocking_script = rawtx[cursor:cursor + script_size]
+        cursor += script_size
+        if len(rawtx) < cursor + 4:
+            raise TransactionError("Input sequence number not found. Probably malformed raw transaction")
+        sequence = _UINT32.unpack_from(rawtx, cursor)[0]
         cursor += 4
-        inputs.append(Input(prev_txid=inp_hash, output_n=output_n, unlocking_script=unlocking_script,
-                            witness_type=inp_type, sequence=sequence_number, index_n=n, network=network))
-    if len(inputs) != n_inputs:
-        raise TransactionError("Error parsing inputs. Number of tx specified %d but %d found" % (n_inputs, len(inputs)))
-
-    outputs = []
-    n_outputs, size = varbyteint_to_int(rawtx[cursor:cursor + 9])
+        inputs.append({
+            'index_n': n,
+            'prev_txid': prev_txid,
+            'output_n': output_n,
+            'unlocking_script': unlocking_script,
+            'sequence': sequence,
+            'witnesses': [],
+        })
+
+    n_outputs, size = _varint_unpack_from(rawtx, cursor)
     cursor += size
+    outputs = []
     output_total = 0
-    for n in range(0, n_outputs):
-        value = int.from_bytes(rawtx[cursor:cursor + 8][::-1], 'big')
+    for n in range(n_outputs):
+        if len(rawtx) < cursor + 8:
+            raise TransactionError("Output value not found. Probably malformed raw transaction")
+        value = _UINT64.unpack_from(rawtx, cursor)[0]
         cursor += 8
-        lock_script_size, size = varbyteint_to_int(rawtx[cursor:cursor + 9])
+        script_size, size = _varint_unpack_from(rawtx, cursor)
         cursor += size
-        lock_script = rawtx[cursor:cursor + lock_script_size]
-        cursor += lock_script_size
-        outputs.append(Output(value=value, lock_script=lock_script, network=network, output_n=n))
+        outputs.append({
+            'output_n': n,
+            'value': value,
+            'lock_script': rawtx[cursor:cursor + script_size],
+        })
+        cursor += script_size
         output_total += value
     if not outputs:
         raise TransactionError("Error no outputs found in this transaction")
+    body_end = cursor
 
     if witness_type == 'segwit':
-        for n in range(0, len(inputs)):
-            n_items, size = varbyteint_to_int(rawtx[cursor:cursor + 9])
+        for inp in inputs:
+            n_items, size = _varint_unpack_from(rawtx, cursor)
             cursor += size
-            witnesses = []
-            for m in range(0, n_items):
-                witness = b'\0'
-                item_size, size = varbyteint_to_int(rawtx[cursor:cursor + 9])
-                if item_size:
-                    witness = rawtx[cursor + size:cursor + item_size + size]
-                cursor += item_size + size
-                witnesses.append(witness)
+            for m in range(n_items):
+                item_size, size = _varint_unpack_from(rawtx, cursor)
+                cursor += size
+                inp['witnesses'].append(rawtx[cursor:cursor + item_size])
+                cursor += item_size
+
+    if len(rawtx) - cursor < 4 or (check_size and len(rawtx) - cursor != 4):
+        raise TransactionError("Error when deserializing raw transaction, bytes left for locktime must be 4 not %d" %
+                               (len(rawtx) - cursor))
+    locktime = _UINT32.unpack_from(rawtx, cursor)[0]
+    cursor += 4
+
+    if witness_type == 'segwit':
+        txid = double_sha256(mv[:4].tobytes() + mv[body_start:body_end] + mv[cursor - 4:cursor])[::-1]
+    else:
+        txid = double_sha256(mv[:cursor])[::-1]
+
+    return {
+        'txid': txid.hex(),
+        'version': version,
+        'witness_type': witness_type,
+        'coinbase': coinbase,
+        'flag': flag,
+        'inputs': inputs,
+        'outputs': outputs,
+        'output_total': output_total,
+        'locktime': locktime,
+        'size': cursor,
+    }
+
+
+@deprecated  # Replaced by Transaction.parse() in version 0.6
+def transaction_deserialize(rawtx, network=DEFAULT_NETWORK, check_size=True):
+    """
+    Deserialize a raw transaction
+    
+    Returns a dictionary with list of input and output objects, locktime and version.
+    
+    Will raise an error if wrong number of inputs are found or if there are no output found.
+    
+    :param rawtx: Raw transaction as hexadecimal string or bytes
+    :type rawtx: str, bytes
+    :param network: Network code, i.e. 'bitcoin', 'testnet', 'litecoin', etc. Leave emtpy for default network
+    :type network: str, Network
+    :param check_size: Check if not bytes are left when parsing is finished. Disable when parsing list of transactions, such as the transactions in a raw block. Default is True
+    :type check_size: bool
+
+    :return Transaction:
+    """
+
+    rawtx = to_bytes(rawtx)
+    if not isinstance(network, Network):
+        network = Network(network)
+    td = transaction_deserialize_fast(rawtx, check_size=check_size)
+    coinbase = td['coinbase']
+    witness_type = td['witness_type']
+    flag = None if td['flag'] is None else bytes([td['flag']])
+
+    inputs = []
+    for inp in td['inputs']:
+        inp_type = 'legacy'
+        if witness_type == 'segwit' and not inp['unlocking_script']:
+            inp_type = 'segwit'
+        inputs.append(Input(prev_txid=inp['prev_txid'], output_n=inp['output_n'],
+                            unlocking_script=inp['unlocking_script'], witness_type=inp_type,
+                            sequence=inp['sequence'], index_n=inp['index_n'], network=network))
+    outputs = [Output(value=outp['value'], lock_script=outp['lock_script'], network=network,
+                      output_n=outp['output_n']) for outp in td['outputs']]
+
+    if witness_type == 'segwit':
+        for n in range(0, len(inputs)):
+            witnesses = [witness if witness else b'\0' for witness in td['inputs'][n]['witnesses']]
             if witnesses and not coinbase:
                 script_type = inputs[n].script_type
                 witness_script_type = 'sig_pubkey'
@@ -175,13 +274,10 @@ def transaction_deserialize(rawtx, network=DEFAULT_NETWORK, check_size=True):
                                   signatures=signatures, witness_type=inp_witness_type, script_type=script_type,
                                   sequence=inputs[n].sequence, index_n=inputs[n].index_n, public_hash=public_hash,
                                   network=inputs[n].network, witnesses=witnesses)
-    if len(rawtx[cursor:]) != 4 and check_size:
-        raise TransactionError("Error when deserializing raw transaction, bytes left for locktime must be 4 not %d" %
-                               len(rawtx[cursor:]))
-    locktime = int.from_bytes(rawtx[cursor:cursor + 4][::-1], 'big')
 
-    return Transaction(inputs, outputs, locktime, version, network, size=cursor + 4, output_total=output_total,
-                       coinbase=coinbase, flag=flag, witness_type=witness_type, rawtx=rawtx)
+    return Transaction(inputs, outputs, td['locktime'], td['version'], network, size=td['size'],
+                       output_total=td['output_total'], coinbase=coinbase, flag=flag, witness_type=witness_type,
+                       rawtx=rawtx)
 
 
 @deprecated  # Replaced by Script class in version 0.6
@@ -655,6 +751,13 @@ class Input(object):
     Inputs are verified by the Transaction class.
     """
 
+    # No __dict__ per input, saves memory and allocation time when parsing large numbers of transactions
+    __slots__ = ('prev_txid', 'output_n', 'output_n_int', 'unlocking_script', 'unlocking_script_unsigned', 'script',
+                 'sequence', 'compressed', 'network', 'index_n', 'value', 'keys', 'public_hash', 'sort', 'address',
+                 'encoding', 'signatures', 'redeemscript', 'script_type', 'double_spend', 'locktime_cltv',
+                 'locktime_csv', 'witness_type', 'valid', 'key_path', 'witnesses', 'script_code', 'sigs_required',
+                 'hash_type')
+
     def __init__(self, prev_txid, output_n, keys=None, signatures=None, public_hash=b'', unlocking_script=b'',
                  unlocking_script_unsigned=None, script=None, script_type=None, address='',
                  sequence=0xffffffff, compressed=None, sigs_required=None, sort=False, index_n=0,
@@ -864,16 +967,20 @@ class Input(object):
 
         :return Input:
         """
-        prev_hash = raw.read(32)[::-1]
-        if len(prev_hash) != 32:
+        outpoint = raw.read(36)
+        if len(outpoint) != 36:
             raise TransactionError("Input transaction hash not found. Probably malformed raw transaction")
-        output_n = raw.read(4)[::-1]
+        prev_hash = outpoint[31::-1]
+        output_n = _UINT32.unpack_from(outpoint, 32)[0]
         unlocking_script_size = read_varbyteint(raw)
         unlocking_script = raw.read(unlocking_script_size)
         inp_type = 'legacy'
         if witness_type == 'segwit' and not unlocking_script_size:
             inp_type = 'segwit'
         sequence_number = raw.read(4)
+        if len(sequence_number) != 4:
+            raise TransactionError("Input sequence number not found. Probably malformed raw transaction")
+        sequence_number = _UINT32.unpack(sequence_number)[0]
 
         return Input(prev_txid=prev_hash, output_n=output_n, unlocking_script=unlocking_script,
                      witness_type=inp_type, sequence=sequence_number, index_n=index_n, strict=strict, network=network)
@@ -1002,6 +1109,13 @@ class Input(object):
             pks.append(k.public_hex)
         if len(self.keys) == 1:
             pks = pks[0]
+        signatures = []
+        for sig in self.signatures:
+            try:
+                signatures.append(sig.hex())
+            except BKeyError:
+                # r and s values of signature cannot be decoded, use DER encoded signature instead
+                signatures.append(sig.as_der_encoded(as_hex=True))
         return {
             'index_n': self.index_n,
             'prev_txid': self.prev_txid.hex(),
@@ -1016,7 +1130,7 @@ class Input(object):
             'script': self.unlocking_script.hex(),
             'redeemscript': self.redeemscript.hex(),
             'sequence': self.sequence,
-            'signatures': [s.hex() for s in self.signatures],
+            'signatures': signatures,
             'sigs_required': self.sigs_required,
             'locktime_cltv': self.locktime_cltv,
             'locktime_csv': self.locktime_csv,
@@ -1030,6 +1144,13 @@ class Input(object):
             'valid': self.valid,
         }
 
+    def __setstate__(self, state):
+        # Pickles created before __slots__ was added to this class contain a dictionary with all attributes
+        if isinstance(state, tuple):
+            state = dict(state[0] or {}, **state[1])
+        for key, value in state.items():
+            setattr(self, key, value)
+
     def __repr__(self):
         return "<Input(prev_txid='%s', output_n=%d, address='%s', index_n=%s, type='%s')>" % \
                (self.prev_txid.hex(), self.output_n_int, self.address, self.index_n, self.script_type)
@@ -1192,7 +1313,10 @@ class Output(object):
 
         :return Output:
         """
-        value = int.from_bytes(raw.read(8)[::-1], 'big')
+        value = raw.read(8)
+        if len(value) != 8:
+            raise TransactionError("Output value not found. Probably malformed raw transaction")
+        value = _UINT64.unpack(value)[0]
         lock_script_size = read_varbyteint(raw)
         lock_script = raw.read(lock_script_size)
         return Output(value=value, lock_script=lock_script, output_n=output_n, strict=strict, network=network)
@@ -1419,7 +1543,10 @@ class Transaction(object):
 
                 inputs[n].update_scripts()
 
-        locktime = int.from_bytes(rawtx.read(4)[::-1], 'big')
+        locktime = rawtx.read(4)
+        if len(locktime) != 4:
+            raise TransactionError("Transaction locktime not found. Probably malformed raw transaction")
+        locktime = _UINT32.unpack(locktime)[0]
         raw_len = len(raw_bytes)
         if not raw_bytes:
             pos_end = rawtx.tell()
@@ -1920,15 +2047,30 @@ class Transaction(object):
         :return bytes: Segwit transaction signature
         """
         assert (self.witness_type == 'segwit')
-        prevouts_serialized = b''
-        sequence_serialized = b''
-        outputs_serialized = b''
+        return self._signature_segwit(sign_id, hash_type, self._segwit_hashes(sign_id, hash_type))
+
+    def _segwit_hashes(self, sign_id, hash_type=SIGHASH_ALL):
+        """
+        Calculate the hashPrevouts, hashSequence and hashOutputs values as defined in BIP143. These values are the
+        same for all inputs, except for the hashOutputs value when SIGHASH_SINGLE or SIGHASH_NONE is used.
+
+        :param sign_id: Index of input to sign
+        :type sign_id: int
+        :param hash_type: Specific hash type, default is SIGHASH_ALL
+        :type hash_type: int
+
+        :return tuple: (hash_prevouts, hash_sequence, hash_outputs)
+        """
+        prevouts_serialized = bytearray()
+        sequence_serialized = bytearray()
+        outputs_serialized = bytearray()
         hash_prevouts = b'\0' * 32
         hash_sequence = b'\0' * 32
         hash_outputs = b'\0' * 32
 
         for i in self.inputs:
-            prevouts_serialized += i.prev_txid[::-1] + i.output_n[::-1]
+            prevouts_serialized += i.prev_txid[::-1]
+            prevouts_serialized += i.output_n[::-1]
             sequence_serialized += i.sequence.to_bytes(4, 'little')
         if not hash_type & SIGHASH_ANYONECANPAY:
             hash_prevouts = double_sha256(prevouts_serialized)
@@ -1943,6 +2085,23 @@ class Transaction(object):
             outputs_serialized += int(self.outputs[sign_id].value).to_bytes(8, 'little')
             outputs_serialized += varstr(self.outputs[sign_id].lock_script)
             hash_outputs = double_sha256(outputs_serialized)
+        return hash_prevouts, hash_sequence, hash_outputs
+
+    def _signature_segwit(self, sign_id, hash_type, segwit_hashes):
+        """
+        Serialize transaction signature for segregated witness transaction with precalculated BIP143 hashes.
+        Use the :func:`signature_segwit` method instead.
+
+        :param sign_id: Index of input to sign
+        :type sign_id: int
+        :param hash_type: Specific hash type
+        :type hash_type: int
+        :param segwit_hashes: Tuple with hash_prevouts, hash_sequence and hash_outputs as returned by _segwit_hashes
+        :type segwit_hashes: tuple
+
+        :return bytes: Segwit transaction signature
+        """
+        hash_prevouts, hash_sequence, hash_outputs = segwit_hashes
 
         if not self.inputs[sign_id].value:
             raise TransactionError("Need value of input %d to create transaction signature, value can not be 0" %
@@ -1982,19 +2141,24 @@ class Transaction(object):
         if witness_type is None:
             witness_type = self.witness_type
 
-        r = self.version[::-1]
-        if sign_id is None and witness_type == 'segwit':
+        # Witness data is only part of the fully signed segwit transaction, skip it when serializing for signing
+        include_witness = sign_id is None and witness_type == 'segwit'
+        r = bytearray(self.version[::-1])
+        if include_witness:
             r += b'\x00'  # marker (BIP 141)
             r += b'\x01'  # flag (BIP 141)
 
         r += int_to_varbyteint(len(self.inputs))
-        r_witness = b''
+        r_witness = bytearray()
         for i in self.inputs:
-            r += i.prev_txid[::-1] + i.output_n[::-1]
-            if i.witnesses and i.witness_type != 'legacy':
-                r_witness += int_to_varbyteint(len(i.witnesses)) + b''.join([bytes(varstr(w)) for w in i.witnesses])
-            else:
-                r_witness += b'\0'
+            r += i.prev_txid[::-1]
+            r += i.output_n[::-1]
+            if include_witness:
+                if i.witnesses and i.witness_type != 'legacy':
+                    r_witness += int_to_varbyteint(len(i.witnesses)) + \
+                        b''.join([bytes(varstr(w)) for w in i.witnesses])
+                else:
+                    r_witness += b'\0'
             if sign_id is None:
                 r += varstr(i.unlocking_script)
             elif sign_id == i.index_n:
@@ -2010,7 +2174,7 @@ class Transaction(object):
             r += int(o.value).to_bytes(8, 'little')
             r += varstr(o.lock_script)
 
-        if sign_id is None and witness_type == 'segwit':
+        if include_witness:
             r += r_witness
 
         r += self.locktime.to_bytes(4, 'little')
@@ -2019,7 +2183,7 @@ class Transaction(object):
         else:
             if not self.size and b'' not in [i.unlocking_script for i in self.inputs]:
                 self.size = len(r)
-        return r
+        return bytes(r)
 
     def raw_hex(self, sign_id=None, hash_type=SIGHASH_ALL, witness_type=None):
         """
@@ -2043,10 +2207,61 @@ class Transaction(object):
 
         :return bytes:
         """
-        witness_data = b''
+        witness_data = bytearray()
         for i in self.inputs:
-            witness_data += int_to_varbyteint(len(i.witnesses)) + b''.join([bytes(varstr(w)) for w in i.witnesses])
-        return witness_data
+            witness_data += int_to_varbyteint(len(i.witnesses))
+            witness_data += b''.join([bytes(varstr(w)) for w in i.witnesses])
+        return bytes(witness_data)
+
+    def _sighash_preimages(self, hash_type=SIGHASH_ALL):
+        """
+        Generator which yields the data to sign for each input of this transaction, in order of inputs. Returns the
+        same data as the :func:`signature` method but shares the serialization work between all inputs.
+
+        For legacy inputs the transaction is serialized only once in a single buffer with empty unlocking scripts, and
+        for each input the unsigned unlocking script is patched in place. The yielded bytearray is reused, so hash or
+        copy it before requesting the next item. For segwit inputs the BIP143 hashes are calculated only once.
+
+        :param hash_type: Specific hash type, default is SIGHASH_ALL
+        :type hash_type: int
+
+        :return bytes, bytearray: Transaction signature for next input
+        """
+        legacy_tx = None
+        script_offsets = {}
+        segwit_hashes = None
+        per_input_hashes = (hash_type & 0x1f) in [SIGHASH_SINGLE, SIGHASH_NONE]
+        for sign_id, inp in enumerate(self.inputs):
+            if inp.witness_type == 'legacy':
+                if legacy_tx is None:
+                    legacy_tx = bytearray(self.version[::-1])
+                    legacy_tx += int_to_varbyteint(len(self.inputs))
+                    for i in self.inputs:
+                        legacy_tx += i.prev_txid[::-1]
+                        legacy_tx += i.output_n[::-1]
+                        script_offsets[i.index_n] = len(legacy_tx)
+                        legacy_tx += b'\0'
+                        legacy_tx += i.sequence.to_bytes(4, 'little')
+                    legacy_tx += int_to_varbyteint(len(self.outputs))
+                    for o in self.outputs:
+                        if o.value < 0:
+                            raise TransactionError("Output value < 0 not allowed")
+                        legacy_tx += int(o.value).to_bytes(8, 'little')
+                        legacy_tx += varstr(o.lock_script)
+                    legacy_tx += self.locktime.to_bytes(4, 'little')
+                    legacy_tx += hash_type.to_bytes(4, 'little')
+                pos = script_offsets[inp.index_n]
+                script = varstr(inp.unlocking_script_unsigned)
+                legacy_tx[pos:pos + 1] = script
+                yield legacy_tx
+                legacy_tx[pos:pos + len(script)] = b'\0'
+            elif inp.witness_type in ['segwit', 'p2sh-segwit']:
+                assert (self.witness_type == 'segwit')
+                if segwit_hashes is None or per_input_hashes:
+                    segwit_hashes = self._segwit_hashes(sign_id, hash_type)
+                yield self._signature_segwit(sign_id, hash_type, segwit_hashes)
+            else:
+                raise TransactionError("Witness_type %s not supported" % self.witness_type)
 
     def verify(self):
         """
@@ -2058,17 +2273,18 @@ class Transaction(object):
         """
 
         self.verified = False
+        preimages = self._sighash_preimages()
         for i in self.inputs:
             if i.script_type == 'coinbase':
                 i.valid = True
                 break
             if not i.signatures:
-                _logger.info("No signatures found for transaction input %d" % i.index_n)
+                _logger.info("No signatures found for transaction input %d", i.index_n)
                 return False
             try:
-                transaction_hash = self.signature_hash(i.index_n, witness_type=i.witness_type)
+                transaction_hash = double_sha256(next(preimages))
             except TransactionError as e:
-                _logger.info("Could not create transaction hash. Error: %s" % e)
+                _logger.info("Could not create transaction hash. Error: %s", e)
                 return False
             if not transaction_hash:
                 _logger.info("Need at least 1 key to create segwit transaction signature")
@@ -2080,8 +2296,8 @@ class Transaction(object):
             while sigs_verified < i.sigs_required:
                 if key_n >= len(i.keys):
                     _logger.info(
-                        "Not enough valid signatures provided for input %d. Found %d signatures but %d needed" %
-                        (i.index_n, sigs_verified, i.sigs_required))
+                        "Not enough valid signatures provided for input %d. Found %d signatures but %d needed",
+                        i.index_n, sigs_verified, i.sigs_required)
                     return False
                 if sig_n >= len(i.signatures):
                     _logger.info("No valid signatures found")
@@ -7,7 +7,10 @@
 #    © 2018 March - 1200 Web Development <http://1200wd.com/>
 #
 
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pprint import pprint
+from bitcoinlib.encoding import USE_COINCURVE
 from bitcoinlib.transactions import *
 from bitcoinlib.services.bitcoind import BitcoindClient
 
@@ -25,8 +28,21 @@ t = Transaction.parse_hex(rt)
 pprint(t.as_dict())
 print("Verified: %s" % t.verify())
 
+
+def parse_and_verify(rt):
+    t = Transaction.parse_hex(rt)
+    try:
+        return t, t.verify(), None
+    except TransactionError as Err:
+        return t, False, Err
+
+
 # Deserialize transactions in latest block with bitcoind client
+# All raw transactions are retrieved with a single batched request. With coincurve installed signatures are
+# verified by libsecp256k1, which releases the GIL, so transactions are verified in a thread pool. The pure Python
+# backends hold the GIL and do not benefit from extra threads.
 MAX_TRANSACTIONS_VIEW = 100
+MAX_WORKERS = os.cpu_count() if USE_COINCURVE else 1
 error_count = 0
 if MAX_TRANSACTIONS_VIEW:
     print("\n=== DESERIALIZE LAST BLOCKS TRANSACTIONS ===")
@@ -35,19 +51,19 @@ if MAX_TRANSACTIONS_VIEW:
     print('... %d transactions found' % len(bestblock['tx']))
     ci = 0
     ct = len(bestblock['tx'])
-    for txid in bestblock['tx']:
-        ci += 1
-        print("\n[%d/%d] Deserialize txid %s" % (ci, ct, txid))
-        rt = bdc.getrawtransaction(txid)
-        print("Raw: %s" % rt)
-        t = Transaction.parse_hex(rt)
-        pprint(t.as_dict())
-        try:
-            print("Verified: %s" % t.verify())
-        except TransactionError as Err:
-            print("Verification Error:", Err)
-        if ci > MAX_TRANSACTIONS_VIEW:
-            break
+    txids = bestblock['tx'][:MAX_TRANSACTIONS_VIEW]
+    rawtxs = bdc.proxy.batch_([['getrawtransaction', txid] for txid in txids])
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        results = executor.map(parse_and_verify, rawtxs)
+        for txid, rt, (t, verified, Err) in zip(txids, rawtxs, results):
+            ci += 1
+            print("\n[%d/%d] Deserialize txid %s" % (ci, ct, txid))
+            print("Raw: %s" % rt)
+            pprint(t.as_dict())
+            if Err:
+                print("Verification Error:", Err)
+            else:
+                print("Verified: %s" % verified)
     print("===   %d raw transactions deserialised   ===" %
           (ct if ct < MAX_TRANSACTIONS_VIEW else MAX_TRANSACTIONS_VIEW))
     print("===   errorcount %d" % error_count)
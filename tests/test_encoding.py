@@ -19,6 +19,7 @@
 #
 
 import unittest
+from io import BytesIO
 
 from bitcoinlib.config.opcodes import op
 from bitcoinlib.encoding import *
@@ -193,6 +194,15 @@ class TestEncodingMethodsStructures(unittest.TestCase):
     def test_int_to_varbyteint_3(self):
         self.assertEqual(b'\xff\xff\xff\xff\xff\xff\xff\xff\xff', int_to_varbyteint(18446744073709551615))
 
+    def test_read_varbyteint(self):
+        s = BytesIO(b'd\xfd\xfd\x00\xff\xf0\xd8\x9f\xf9\x07\xaf\xea\xff\x01')
+        self.assertEqual(read_varbyteint(s), 100)
+        self.assertEqual(read_varbyteint(s), 253)
+        self.assertEqual(read_varbyteint(s), 18440744073009551600)
+        self.assertEqual(s.read(), b'\x01')
+        self.assertRaisesRegexp(EncodingError, "end of stream reached", read_varbyteint, s)
+        self.assertRaisesRegexp(EncodingError, "end of stream reached", read_varbyteint, BytesIO(b'\xfd\x01'))
+
     def test_varstr(self):
         self.assertEqual(b'\x1eThis string has a length of 30',
                          varstr('This string has a length of 30'))
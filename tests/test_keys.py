@@ -19,6 +19,7 @@
 #
 
 import os
+import pickle
 import unittest
 import json
 from bitcoinlib.networks import NETWORK_DEFINITIONS
@@ -880,6 +881,40 @@ class TestKeysSignatures(unittest.TestCase):
         self.assertEqual(sig.bytes(), expected_sig_bytes)
         self.assertEqual(sig.hex(), expected_sig_hex)
 
+    def test_signatures_verify_high_s(self):
+        txid = '0d12fdc4aac9eaaab9730999e0ce84c3bd5bb38dfd1f4c90c613ee177987429c'
+        pub_key = HDKey('b2da575054fb5daba0efde613b0b8e37159b8110e4be50f73cbe6479f6038f5b').public()
+        sig = Signature.create(txid, 'b2da575054fb5daba0efde613b0b8e37159b8110e4be50f73cbe6479f6038f5b', k=1002)
+        sig_high_s = Signature(sig.r, secp256k1_n - sig.s)
+        self.assertTrue(sig_high_s.verify(txid, pub_key))
+        self.assertFalse(Signature(sig.r, sig.s + 1).verify(txid, pub_key))
+
+    def test_signatures_parse_der_lazy(self):
+        txid = '0d12fdc4aac9eaaab9730999e0ce84c3bd5bb38dfd1f4c90c613ee177987429c'
+        pub_key = HDKey('b2da575054fb5daba0efde613b0b8e37159b8110e4be50f73cbe6479f6038f5b').public()
+        sig = Signature.create(txid, 'b2da575054fb5daba0efde613b0b8e37159b8110e4be50f73cbe6479f6038f5b', k=1002)
+        sig_der = Signature.parse_bytes(sig.as_der_encoded())
+        self.assertEqual(sig_der.as_der_encoded(), sig.as_der_encoded())
+        self.assertTrue(sig_der.verify(txid, pub_key))
+        self.assertFalse(Signature.parse_bytes(sig.as_der_encoded()).verify(txid[:-1] + 'd', pub_key))
+        self.assertEqual((sig_der.r, sig_der.s), (sig.r, sig.s))
+        self.assertEqual(sig_der.hex(), sig.hex())
+        sig_high_s = Signature.parse_bytes(der_encode_sig(sig.r, secp256k1_n - sig.s) + b'\x01')
+        self.assertTrue(sig_high_s.verify(txid, pub_key))
+
+    def test_signatures_unpickle(self):
+        # Transaction pickled with bitcoinlib 0.6.3, before r and s were decoded lazily
+        filename = os.path.join(os.path.dirname(__file__), "transaction063.pickle")
+        with open(filename, "rb") as pickle_in:
+            t = pickle.load(pickle_in)
+        sig = t.inputs[0].signatures[0]
+        self.assertEqual(sig.r, 0xebdb48562c1b3c1e0bf2c528d2de697f9b84da1b3eafa10f6c542e4d8e9e3ce2)
+        self.assertEqual(sig.s, 0xdc6cfe349d3de77a717ae1e3c2ad9d9f9b53d68687b07f3f8a72a4c3d7f16b8)
+        self.assertTrue(sig.verify(t.signature_hash(0), t.inputs[0].keys[0]))
+        sig2 = pickle.loads(pickle.dumps(sig))
+        self.assertEqual((sig2.r, sig2.s), (sig.r, sig.s))
+        self.assertEqual(sig2.as_der_encoded(), sig.as_der_encoded())
+
     def test_signatures_rs_out_of_curve(self):
         outofcurveint = 115792089237316195423570985008687907852837564279074904382605163141518161494339
         self.assertRaisesRegexp(BKeyError, "r is not a positive integer smaller than the curve order",
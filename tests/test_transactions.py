@@ -18,9 +18,13 @@
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
 #
 
+import os
+import pickle
 import unittest
 from bitcoinlib.transactions import *
+from bitcoinlib.transactions import _varint_unpack_from
 from bitcoinlib.keys import HDKey, BKeyError
+from bitcoinlib.config.secp256k1 import secp256k1_n
 from tests.test_custom import CustomAssertions
 
 
@@ -37,6 +41,20 @@ class TestTransactionInputs(unittest.TestCase):
         ti = Input(prev_txid=to_bytes(ph), output_n=0)
         self.assertEqual(ph, ti.prev_txid.hex())
 
+    def test_transaction_input_unpickle(self):
+        # Transaction pickled with bitcoinlib 0.6.3, before Input used __slots__
+        filename = os.path.join(os.path.dirname(__file__), "transaction063.pickle")
+        with open(filename, "rb") as pickle_in:
+            t = pickle.load(pickle_in)
+        ti = t.inputs[0]
+        self.assertEqual(ti.prev_txid.hex(), 'fdaa42051b1fc9226797b2ef9700a7148ee8be9466fc8408379814cb0b1d88e3')
+        self.assertEqual(ti.output_n_int, 1)
+        self.assertEqual(ti.value, 100000)
+        self.assertEqual(ti.address, '1JRPsP2HcCSYsaP487TsP31jKzJ8E3eWBy')
+        self.assertTrue(t.verify())
+        ti2 = pickle.loads(pickle.dumps(ti))
+        self.assertEqual(ti2.as_dict(), ti.as_dict())
+
     def test_transaction_input_add_scriptsig(self):
         prev_txid = b"\xe3>\xbd\x17\x93\x8b\xc0\x13\xc6(\x95\x89*\xacT\xdf?[\xce\x96\xe4K\x89I\x94\x92ut\x1b\x14'\xe5"
         output_index = b'\x00\x00\x00\x00'
@@ -178,6 +196,49 @@ class TestTransactions(unittest.TestCase):
         self.assertEqual('1P9RQEr2XeE3PEb44ZE35sfZRRW1JHU8qx',
                          Transaction.parse_hex(rawtx).as_dict()['outputs'][1]['address'])
 
+    def test_transactions_varint_unpack_from(self):
+        for value in [0, 252, 253, 0xffff, 0x10000, 0xffffffff, 0x100000000, 0xffffffffffffffff]:
+            data = b'\x01' + int_to_varbyteint(value) + b'\x02'
+            self.assertEqual(_varint_unpack_from(data, 1), (value, len(data) - 2))
+        self.assertRaisesRegex(TransactionError, "Variable length integer not found", _varint_unpack_from,
+                               b'\x01\xfe\x01\x02', 1)
+
+    def test_transactions_deserialize_truncated(self):
+        rawtx = self.rawtxs[0][1]
+        self.assertRaisesRegex(TransactionError, "Transaction locktime not found", Transaction.parse_hex,
+                               rawtx[:-2])
+        # Input sequence number starts at byte 148, first output value at byte 153
+        self.assertRaisesRegex(TransactionError, "Output value not found", Transaction.parse_hex, rawtx[:312])
+        self.assertRaisesRegex(TransactionError, "Input sequence number not found", Transaction.parse_hex,
+                               rawtx[:300])
+
+    def test_transactions_deserialize_fast(self):
+        for r in self.rawtxs:
+            t = Transaction.parse_hex(r[1], network=r[4])
+            td = transaction_deserialize_fast(r[1])
+            self.assertEqual(td['txid'], t.txid)
+            self.assertEqual(td['size'], t.size)
+            self.assertEqual(td['witness_type'], t.witness_type)
+            self.assertEqual(td['locktime'], t.locktime)
+            self.assertEqual(td['output_total'], t.output_total)
+            self.assertEqual([(i['prev_txid'], i['output_n'], i['unlocking_script'], i['sequence'])
+                              for i in td['inputs']],
+                             [(i.prev_txid, i.output_n_int, i.unlocking_script, i.sequence) for i in t.inputs])
+            self.assertEqual([(o['value'], o['lock_script']) for o in td['outputs']],
+                             [(o.value, o.lock_script) for o in t.outputs])
+        self.assertRaisesRegex(TransactionError, "bytes left for locktime must be 4 not 5",
+                               transaction_deserialize_fast, self.rawtxs[0][1] + '00')
+        self.assertRaisesRegex(TransactionError, "Variable length integer not found",
+                               transaction_deserialize_fast, '01000000')
+        self.assertRaisesRegex(TransactionError, "Variable length integer not found",
+                               transaction_deserialize_fast, '01000000fd01')
+        self.assertRaisesRegex(TransactionError, "Transaction version not found",
+                               transaction_deserialize_fast, '0100')
+        self.assertRaisesRegex(TransactionError, "Input sequence number not found",
+                               transaction_deserialize_fast, self.rawtxs[0][1][:300])
+        self.assertRaisesRegex(TransactionError, "Output value not found",
+                               transaction_deserialize_fast, self.rawtxs[0][1][:312])
+
     def test_transaction_deserialize_raw_coinbase(self):
         rawtx = "02000000010000000000000000000000000000000000000000000000000000000000000000ffffffff4d03f6591c046945e" \
                 "35e2f706f6f6c696e2e636f6d2ffabe6d6d3bd89000dd7bd942b167b95cca4bf887bb60a45511c7fe875b4ece4844893351" \
@@ -270,6 +331,22 @@ class TestTransactions(unittest.TestCase):
         t.sign(pk)
         self.assertTrue(t.verify(), msg="Can not verify transaction '%s'")
 
+    def test_transactions_verify_signature_out_of_range(self):
+        pk = Key('KwbbBb6iz1hGq6dNF9UsHc7cWaXJZfoQGFWeozexqnWA4M7aSwh4')
+        inp = Input(prev_txid='fdaa42051b1fc9226797b2ef9700a7148ee8be9466fc8408379814cb0b1d88e3',
+                    output_n=1, keys=pk.public())
+        out = Output(95000, address='1K5j3KpsSt2FyumzLmoVjmFWVcpFhXHvNF')
+        t = Transaction([inp], [out])
+        t.sign(pk)
+        sig = t.inputs[0].signatures[0]
+        bad_sig = der_encode_sig(secp256k1_n + 1, sig.s) + b'\x01'
+        t.inputs[0].unlocking_script = varstr(bad_sig) + varstr(pk.public_byte)
+        t2 = Transaction.parse_bytes(t.raw())
+        self.assertFalse(t2.verify())
+        self.assertIn('der_signature=%s' % bad_sig.hex(), repr(t2.inputs[0].signatures[0]))
+        self.assertEqual(t2.as_dict()['inputs'][0]['signatures'], [bad_sig.hex()])
+        self.assertIn(bad_sig.hex(), t2.as_json())
+
     def test_transactions_multiple_outputs(self):
         t = Transaction()
         t.add_output(2710000, '1Khyc5eUddbhYZ8bEZi9wiN8TrmQ8uND4j')
@@ -1562,6 +1639,16 @@ class TestTransactionsSegwit(unittest.TestCase, CustomAssertions):
         t.inputs[0].value = 61501176
         self.assertTrue(t.verify())
 
+        t2 = transaction_deserialize(rawtx)
+        self.assertEqual(t2.txid, 'bbff3196a5668f5d90a901056adcc8c6dbec2e7ba0b9721772ea45693f08ce81')
+        self.assertEqual(t2.raw_hex(), rawtx)
+        self.assertEqual(t2.size, 417)
+        self.assertEqual(t2.output_total, 61461176)
+        self.assertEqual(t2.inputs[0].script_type, 'p2sh_multisig')
+        self.assertEqual(t2.inputs[0].witnesses, t.inputs[0].witnesses)
+        self.assertEqual(len(t2.inputs[0].signatures), 2)
+        self.assertEqual(t2.inputs[0].address, t.inputs[0].address)
+
     def test_transaction_segwit_deserialize_p2wpkh(self):
         # Random segwit p2wpkh transaction - 299dab85f10c37c6296d4fb10eaa323fb456a5e7ada9adf41389c447daa9c0e4
         rawtx = "02000000000101b99ef54dd7695be7574ac6fb4a6d1a2dd98cb4ec7ee53b06117754da424a4c440100000000ffffffff01" \
@@ -1610,6 +1697,29 @@ class TestTransactionsSegwit(unittest.TestCase, CustomAssertions):
                          'c37af31116d1b27caf68aae9e3ac82f1477929014d5b917657d0eb49478cb670')
         self.assertTrue(t2.verify())
 
+    def test_transaction_segwit_sighash_preimages(self):
+        pk1 = Key('bbc27228ddcb9209d7fd6f36b02f7dfa6252af40bb2f1cbc7a557da8027ff866')
+        pk2 = Key('619c335025c7f4012e556c2a58b2506e30b8511b53ade95ea316fd8c3286feb9')
+        pk3 = Key('eb696a065ef48a2192da5b28b694f87544b30fae8327c4510137a922f32c6dcf')
+        inp_prev_tx1 = bytes.fromhex('fff7f7881a8099afa6940d42d1e7f6362bec38171ea3edf433541db4e4ad969f')[::-1]
+        inp_prev_tx2 = bytes.fromhex('ef51e1b804cc89d182d279655c3aa89e815b1b309fe287d9b2b55d57b90ec68a')[::-1]
+        inputs = [
+            Input(inp_prev_tx1, 0, sequence=0xffffffee, keys=pk1, value=625000000, index_n=0),
+            Input(inp_prev_tx2, 1, witness_type='segwit', keys=pk2, value=600000000, index_n=1),
+            Input(inp_prev_tx2, 2, keys=pk3, value=100000000, index_n=2),
+        ]
+        outputs = [
+            Output(112340000, lock_script='76a9148280b37df378db99f66f85c95a783a76ac7a6d5988ac'),
+            Output(223450000, lock_script='76a9143bde42dbee7e4dbe6a21b2d50ce2f0167faa815988ac'),
+        ]
+        t = Transaction(inputs, outputs, witness_type='segwit', locktime=0x00000011)
+        expected = [t.signature(n, witness_type=t.inputs[n].witness_type) for n in range(3)]
+        self.assertEqual([bytes(preimage) for preimage in t._sighash_preimages()], expected)
+        t.sign([pk1], 0)
+        t.sign([pk2], 1)
+        t.sign([pk3], 2)
+        self.assertTrue(t.verify())
+
     def test_transactions_segwit_p2sh_p2wpkh(self):
         pk_input1 = 'eb696a065ef48a2192da5b28b694f87544b30fae8327c4510137a922f32c6dcf'
         pk1 = Key(pk_input1)